@@ -6,9 +6,11 @@ Indicators Calculator Script
 Key Features:
 - BTD/STR calculation using Larry Williams' VixFix methodology
 - Multi-timeframe analysis: 22, 66, and 132-period lookbacks
-- Pandas-based data processing with 150-day rolling window requirements
+- NumPy-based data processing with 140-day rolling window requirements
 - Safe parameterized SQL queries preventing injection attacks
+- WAL-mode tuned SQLite connections via centralized db_config
 - Database validation with automatic symbol discovery and processing
+- Single-scan bulk read and one batched UPDATE for all symbols
 - Contrarian signal generation: BTD for oversold, STR for overbought conditions
 
 Calculates BTD (Buy The Dip) and STR (Short The Rip) indicators for multiple timeframes.
@@ -19,11 +21,14 @@ import sys
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, List
-import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from itertools import groupby
+from operator import itemgetter
+import numpy as np
 
-# Import centralized logging
+# Import centralized logging and database configuration
 from logging_config import setup_logger, log_script_start, log_script_end
+from db_config import close_db, connect_db, ensure_indexes
 
 # Setup logging
 logger = setup_logger("calculate_indicators")
@@ -32,184 +37,153 @@ logger = setup_logger("calculate_indicators")
 PROJECT_ROOT = Path(__file__).parent.parent
 DB_PATH = PROJECT_ROOT / "data" / "live_stocks.db"
 
+# Indicator lookback periods
+TIMEFRAMES = (22, 66, 132)
+
+# SQL statements kept as constants so sqlite3 reuses the prepared statements
+RECENT_DATA_SQL = """
+SELECT symbol, date, high_price, low_price, close_price
+FROM (
+    SELECT symbol, date, high_price, low_price, close_price,
+           ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) AS rn
+    FROM stock_data
+)
+WHERE rn <= ?
+ORDER BY symbol, date
+"""
+
+UPDATE_INDICATORS_SQL = """
+UPDATE stock_data SET
+    btd_22 = COALESCE(?, btd_22),
+    btd_66 = COALESCE(?, btd_66),
+    btd_132 = COALESCE(?, btd_132),
+    str_22 = COALESCE(?, str_22),
+    str_66 = COALESCE(?, str_66),
+    str_132 = COALESCE(?, str_132)
+WHERE symbol = ? AND date = ?
+"""
+
 
-def get_stock_data(symbol: str, days: int = 150) -> pd.DataFrame:
-    """Retrieve OHLCV data for symbol from database.
+def get_recent_stock_data(
+    conn: sqlite3.Connection, days: int = 140
+) -> List[Tuple[str, str, np.ndarray]]:
+    """Retrieve recent price data for all symbols in a single query.
 
     Essential Features:
-    - Parameterized SQL query with ORDER BY date DESC for recent data
-    - LIMIT clause for efficient data retrieval (default: 150 days)
-    - Pandas DataFrame conversion with date parsing and sorting
-    - Empty DataFrame handling for missing symbols
+    - One ROW_NUMBER() window scan instead of one query per symbol
+    - Keeps the latest `days` rows per symbol (default: 140 days)
+    - Raw cursor rows grouped by symbol without a pandas DataFrame
+    - Returns (symbol, latest_date, prices) with prices as a float64 array
+      of [high, low, close] rows in ascending date order
     """
-    conn = sqlite3.connect(DB_PATH)
-    query = """
-        SELECT date, open_price, high_price, low_price, close_price, volume
-        FROM stock_data 
-        WHERE symbol = ? 
-        ORDER BY date DESC 
-        LIMIT ?
-    """
-    df = pd.read_sql_query(query, conn, params=(symbol, days))
-    conn.close()
+    rows = conn.execute(RECENT_DATA_SQL, (days,)).fetchall()
 
-    if df.empty:
-        logger.warning(f"No data for {symbol}")
-        return pd.DataFrame()
+    symbol_data = []
+    for symbol, symbol_rows in groupby(rows, key=itemgetter(0)):
+        symbol_rows = list(symbol_rows)
+        prices = np.array([row[2:] for row in symbol_rows], dtype=np.float64)
+        symbol_data.append((symbol, symbol_rows[-1][1], prices))
 
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date").reset_index(drop=True)
-    return df
+    return symbol_data
 
 
-def calculate_btd_str(df: pd.DataFrame, period: int) -> Tuple[float, float]:
-    """Calculate BTD and STR indicators using VixFix methodology.
+def calculate_btd_str(
+    prices: np.ndarray, periods: Tuple[int, ...] = TIMEFRAMES
+) -> Dict[int, Tuple[Optional[float], Optional[float]]]:
+    """Calculate BTD and STR indicators for several periods using VixFix methodology.
 
     Essential Features:
     - VixFix algorithm: compares current high/low to period min/max close
     - BTD calculation: (current_high - lowest_close_past) / lowest_close_past * 100
     - STR calculation: (current_low - highest_close_past) / highest_close_past * 100
+    - Operates on a [high, low, close] float64 array, sliced per period
     - Data sufficiency validation (period + 1 days minimum required)
     - 2-decimal precision rounding for consistent output
     """
-    if len(df) < period + 1:
-        return None, None
-
-    current_day = df.iloc[-1]
-    high_price = current_day["high_price"]
-    low_price = current_day["low_price"]
-
-    past_data = df.iloc[-(period + 1) : -1]
-    lowest_close = past_data["close_price"].min()
-    highest_close = past_data["close_price"].max()
-
-    btd = (
-        ((high_price - lowest_close) / lowest_close) * 100 if lowest_close > 0 else None
-    )
-    str_value = (
-        ((low_price - highest_close) / highest_close) * 100
-        if highest_close > 0
-        else None
-    )
-
-    return (
-        round(btd, 2) if btd is not None else None,
-        round(str_value, 2) if str_value is not None else None,
-    )
-
-
-def calculate_and_update_btd(symbol: str):
-    """Calculate and store BTD indicators for all timeframes.
-
-    Essential Features:
-    - Multi-timeframe BTD calculation (22, 66, 132 periods)
-    - Data sufficiency validation (minimum 23 days required)
-    - Safe parameterized UPDATE queries with dynamic field construction
-    - Latest date targeting using MAX(date) subquery
-    - Result validation and selective database updates
-    """
-    df = get_stock_data(symbol, days=140)
-    if df.empty or len(df) < 23:
-        logger.warning(f"Insufficient data for {symbol} BTD")
-        return
+    highs, lows, closes = prices.T
+    past_closes = closes[:-1]
+    high_price = highs[-1]
+    low_price = lows[-1]
+
+    results = {}
+    for period in periods:
+        if len(past_closes) < period:
+            results[period] = (None, None)
+            continue
+
+        window = past_closes[-period:]
+        lowest_close = np.nanmin(window)
+        highest_close = np.nanmax(window)
+
+        btd = (
+            ((high_price - lowest_close) / lowest_close) * 100
+            if lowest_close > 0
+            else None
+        )
+        str_value = (
+            ((low_price - highest_close) / highest_close) * 100
+            if highest_close > 0
+            else None
+        )
 
-    btd_22, _ = calculate_btd_str(df, 22)
-    btd_66, _ = calculate_btd_str(df, 66)
-    btd_132, _ = calculate_btd_str(df, 132)
-
-    update_fields = {}
-    if btd_22 is not None:
-        update_fields["btd_22"] = btd_22
-    if btd_66 is not None:
-        update_fields["btd_66"] = btd_66
-    if btd_132 is not None:
-        update_fields["btd_132"] = btd_132
-
-    if update_fields:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-
-        set_clause = ", ".join([f"{col} = ?" for col in update_fields.keys()])
-        query = """UPDATE stock_data SET {} 
-                   WHERE symbol = ? AND date = (SELECT MAX(date) FROM stock_data WHERE symbol = ?)""".format(
-            set_clause
+        results[period] = (
+            round(btd, 2) if btd is not None else None,
+            round(str_value, 2) if str_value is not None else None,
         )
 
-        c.execute(query, list(update_fields.values()) + [symbol, symbol])
-        conn.commit()
-        conn.close()
-        logger.info(f"{symbol} BTD: {update_fields}")
+    return results
 
 
-def calculate_and_update_str(symbol: str):
-    """Calculate and store STR indicators for all timeframes.
+def calculate_symbol_indicators(
+    symbol: str, latest_date: str, prices: np.ndarray
+) -> Optional[Tuple]:
+    """Calculate BTD and STR indicators for all timeframes of one symbol.
 
     Essential Features:
-    - Multi-timeframe STR calculation (22, 66, 132 periods)
+    - Multi-timeframe BTD and STR calculation (22, 66, 132 periods)
     - Data sufficiency validation (minimum 23 days required)
-    - Safe parameterized UPDATE queries with dynamic field construction
-    - Latest date targeting using MAX(date) subquery
-    - Result validation and selective database updates
+    - Returns UPDATE parameters targeting the symbol's latest date
+    - None values leave existing database columns untouched
     """
-    df = get_stock_data(symbol, days=140)
-    if df.empty or len(df) < 23:
-        logger.warning(f"Insufficient data for {symbol} STR")
-        return
-
-    _, str_22 = calculate_btd_str(df, 22)
-    _, str_66 = calculate_btd_str(df, 66)
-    _, str_132 = calculate_btd_str(df, 132)
-
-    update_fields = {}
-    if str_22 is not None:
-        update_fields["str_22"] = str_22
-    if str_66 is not None:
-        update_fields["str_66"] = str_66
-    if str_132 is not None:
-        update_fields["str_132"] = str_132
-
-    if update_fields:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-
-        set_clause = ", ".join([f"{col} = ?" for col in update_fields.keys()])
-        query = """UPDATE stock_data SET {} 
-                   WHERE symbol = ? AND date = (SELECT MAX(date) FROM stock_data WHERE symbol = ?)""".format(
-            set_clause
-        )
-
-        c.execute(query, list(update_fields.values()) + [symbol, symbol])
-        conn.commit()
-        conn.close()
-        logger.info(f"{symbol} STR: {update_fields}")
-
-
-def update_custom_indicators_for_symbol(symbol: str):
-    """Calculate BTD and STR indicators for single symbol.
+    if len(prices) < 23:
+        logger.warning(f"Insufficient data for {symbol} BTD/STR")
+        return None
+
+    results = calculate_btd_str(prices)
+    btd_22, str_22 = results[22]
+    btd_66, str_66 = results[66]
+    btd_132, str_132 = results[132]
+
+    btd_fields = {
+        col: value
+        for col, value in (("btd_22", btd_22), ("btd_66", btd_66), ("btd_132", btd_132))
+        if value is not None
+    }
+    str_fields = {
+        col: value
+        for col, value in (("str_22", str_22), ("str_66", str_66), ("str_132", str_132))
+        if value is not None
+    }
+    logger.info(f"{symbol} BTD: {btd_fields}")
+    logger.info(f"{symbol} STR: {str_fields}")
+
+    return (btd_22, btd_66, btd_132, str_22, str_66, str_132, symbol, latest_date)
+
+
+def update_indicators(conn: sqlite3.Connection, update_rows: List[Tuple]):
+    """Store BTD and STR indicators for all symbols in one batch.
 
     Essential Features:
-    - Sequential execution of BTD and STR calculations
-    - Single symbol processing with error isolation
-    - Database update coordination for both indicator types
+    - Single executemany UPDATE writing all six indicator columns
+    - Latest date passed as a parameter instead of a MAX(date) subquery
+    - COALESCE keeps existing values where a timeframe lacks data
+    - One transaction and commit for the whole run
     """
-    calculate_and_update_btd(symbol)
-    calculate_and_update_str(symbol)
-
-
-def get_all_symbols() -> List[str]:
-    """Retrieve all unique symbols from database.
+    if not update_rows:
+        return
 
-    Essential Features:
-    - DISTINCT symbol query for complete database coverage
-    - Sorted output for consistent processing order
-    - Database connection handling with proper cleanup
-    """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT DISTINCT symbol FROM stock_data")
-    symbols = [row[0] for row in c.fetchall()]
-    conn.close()
-    return symbols
+    conn.executemany(UPDATE_INDICATORS_SQL, update_rows)
+    conn.commit()
 
 
 def main():
@@ -217,6 +191,8 @@ def main():
 
     Essential Features:
     - Complete database symbol processing with progress tracking
+    - Single bulk read, in-memory grouping and one batched UPDATE
+    - One tuned database connection shared by the read and write phases
     - Database existence validation before processing
     - Individual symbol error handling with continue-on-failure
     - Success rate calculation and logging
@@ -232,25 +208,32 @@ def main():
         log_script_end(logger, "Indicators Calculator Script", start_time, False)
         sys.exit(1)
 
+    conn = connect_db(DB_PATH)
     try:
-        symbols = get_all_symbols()
-        if not symbols:
+        ensure_indexes(conn)
+        symbol_data = get_recent_stock_data(conn, days=140)
+        if not symbol_data:
             logger.warning("No symbols in database")
             log_script_end(logger, "Indicators Calculator Script", start_time, False)
             return
 
-        logger.info(f"Processing {len(symbols)} symbols")
+        symbol_count = len(symbol_data)
+        logger.info(f"Processing {symbol_count} symbols")
         processed_count = 0
+        update_rows = []
 
-        for symbol in symbols:
+        for symbol, latest_date, prices in symbol_data:
             try:
-                update_custom_indicators_for_symbol(symbol)
+                row = calculate_symbol_indicators(symbol, latest_date, prices)
+                if row is not None:
+                    update_rows.append(row)
                 processed_count += 1
             except Exception as e:
                 logger.error(f"Error processing {symbol}: {e}", exc_info=True)
                 continue
 
-        logger.info(f"Processed {processed_count}/{len(symbols)} symbols")
+        update_indicators(conn, update_rows)
+        logger.info(f"Processed {processed_count}/{symbol_count} symbols")
         success = processed_count > 0
         log_script_end(logger, "Indicators Calculator Script", start_time, success)
 
@@ -261,6 +244,8 @@ def main():
         logger.error(f"Indicators calculation failed: {e}", exc_info=True)
         log_script_end(logger, "Indicators Calculator Script", start_time, False)
         sys.exit(1)
+    finally:
+        close_db(conn)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+version 3.1.0
+Centralized Database Configuration
+
+Key Features:
+- Single connection factory shared by all scripts
+- WAL journaling so indicator readers never block behind the data writer
+- Relaxed fsync policy (synchronous=NORMAL) safe under WAL
+- In-memory temp storage, larger page cache and memory-mapped reads
+- Busy timeout to ride out short write locks instead of failing
+- Latest-first (symbol, date DESC) index for per-symbol recent-data scans
+- Explicit close helper running PRAGMA optimize after writes
+- Read-only connections for reporting scripts that never write
+
+Applies the same SQLite PRAGMAs to every connection opened against live_stocks.db.
+"""
+
+import sqlite3
+from pathlib import Path
+
+# Get project paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DB_PATH = PROJECT_ROOT / "data" / "live_stocks.db"
+
+# Connection tuning applied right after connect
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB page cache
+    "PRAGMA mmap_size=268435456",  # 256 MB memory-mapped I/O
+    "PRAGMA busy_timeout=5000",  # 5 seconds
+)
+
+# Read-only connections cannot switch journal mode; query_only guards against writes
+READ_ONLY_PRAGMAS = tuple(
+    pragma for pragma in SQLITE_PRAGMAS if "journal_mode" not in pragma
+) + ("PRAGMA query_only=1",)
+
+# Secondary indexes for latest-first per-symbol scans
+SQLITE_INDEXES = (
+    """CREATE INDEX IF NOT EXISTS idx_stock_data_symbol_date_desc
+       ON stock_data(symbol, date DESC)""",
+)
+
+
+def configure_connection(
+    conn: sqlite3.Connection, read_only: bool = False
+) -> sqlite3.Connection:
+    """Apply performance PRAGMAs to an open connection.
+
+    Essential Features:
+    - WAL journal mode persists in the database header after first use
+    - Per-connection settings (synchronous, cache, mmap, timeout) reapplied each time
+    - Read-only connections skip the journal mode switch and set query_only
+    - Returns the same connection for inline use
+    """
+    for pragma in READ_ONLY_PRAGMAS if read_only else SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def ensure_indexes(conn: sqlite3.Connection):
+    """Create secondary indexes on stock_data if they are missing.
+
+    Essential Features:
+    - (symbol, date DESC) index serves ORDER BY date DESC and ROW_NUMBER() scans
+    - Idempotent CREATE INDEX IF NOT EXISTS for safe repeated calls
+    """
+    for statement in SQLITE_INDEXES:
+        conn.execute(statement)
+    conn.commit()
+
+
+def close_db(conn: sqlite3.Connection):
+    """Optimize query planner statistics and close the connection.
+
+    Essential Features:
+    - PRAGMA optimize refreshes statistics only for tables that need it
+    - Explicit close lets the last WAL connection checkpoint cleanly
+    """
+    try:
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+
+
+def connect_db(db_path: Path = DB_PATH, read_only: bool = False) -> sqlite3.Connection:
+    """Open a tuned SQLite connection to the stock database.
+
+    Essential Features:
+    - Drop-in replacement for sqlite3.connect(DB_PATH)
+    - PRAGMAs applied before any query is issued
+    - Optional read-only mode (file URI with mode=ro) for WAL readers
+    """
+    if read_only:
+        uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        return configure_connection(sqlite3.connect(uri, uri=True), read_only=True)
+    return configure_connection(sqlite3.connect(db_path))
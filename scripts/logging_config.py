@@ -8,13 +8,18 @@ Key Features:
 - Shared log files across all scripts for unified monitoring
 - Console and file output with structured formatting
 - Exception logging decorator for error tracking
+- Queue-based handlers so file and console writes run on a background thread
+- Buffered log file writes flushed on a short timer or immediately on errors
 - Cross-platform path handling and log management
 
 Creates shared log files named 'analystbot_YYYY-MM-DD.log' for all bot operations.
 """
 
 import os
+import atexit
+import queue
 import logging
+import threading
 import logging.handlers
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -28,9 +33,131 @@ LOGS_DIR.mkdir(exist_ok=True)
 
 # Logging configuration
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FORMAT = (
+    "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+)
 
 # Logging settings
 LOG_LEVEL = logging.INFO
+LOG_BUFFER_SIZE = 65536  # 64 KB file write buffer
+LOG_FLUSH_INTERVAL = 1.0  # seconds a buffered record may wait before flush
+
+# Configured loggers keyed by script name
+_LOGGER_CACHE = {}
+
+# Daily log file resolved once per process
+_LOG_FILE = None
+
+# Formatter and queue handler shared by every logger in the process
+_FORMATTER = logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+_QUEUE_HANDLER = None
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """FileHandler that buffers writes instead of flushing every record.
+
+    Essential Features:
+    - Large userspace write buffer to cut write() syscalls on SD card storage
+    - Timer-driven flush bounds how long a record stays invisible in the file
+    - ERROR and above flushed immediately so failures are never held back
+    """
+
+    def __init__(
+        self,
+        filename,
+        encoding=None,
+        buffer_size: int = LOG_BUFFER_SIZE,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._flush_timer = None
+        super().__init__(filename, encoding=encoding)
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(
+                    self.flush_interval, self._timed_flush
+                )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _timed_flush(self):
+        with self.lock:
+            self._flush_timer = None
+            self.flush()
+
+    def close(self):
+        with self.lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        super().close()
+
+
+def get_log_file() -> Path:
+    """Return today's shared log file path, resolved once per process.
+
+    Essential Features:
+    - Date lookup and path construction done on first call only
+    - Keeps a whole run in one file even if it crosses midnight
+    - File itself is created by the handler on open
+    """
+    global _LOG_FILE
+    if _LOG_FILE is None:
+        today = datetime.now().strftime("%Y-%m-%d")
+        _LOG_FILE = LOGS_DIR / f"analystbot_{today}.log"
+    return _LOG_FILE
+
+
+def get_queue_handler() -> logging.Handler:
+    """Return the process-wide QueueHandler, starting its listener on first use.
+
+    Essential Features:
+    - One buffered file handler and one console handler per process
+    - Shared formatter; the logger name fills the script column
+    - QueueListener thread performs all file and console I/O
+    - Handlers left at NOTSET; each logger's own level does the filtering
+    - Listener stopped at exit so queued records are flushed
+    """
+    global _QUEUE_HANDLER
+    if _QUEUE_HANDLER is not None:
+        return _QUEUE_HANDLER
+
+    file_handler = BufferedFileHandler(get_log_file(), encoding="utf-8")
+    file_handler.setFormatter(_FORMATTER)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(_FORMATTER)
+
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    _QUEUE_HANDLER = logging.handlers.QueueHandler(log_queue)
+    return _QUEUE_HANDLER
 
 
 def setup_logger(script_name: str, log_level: int = LOG_LEVEL) -> logging.Logger:
@@ -38,9 +165,11 @@ def setup_logger(script_name: str, log_level: int = LOG_LEVEL) -> logging.Logger
 
     Essential Features:
     - Creates daily log files with automatic directory creation
+    - Returns cached loggers without touching the logging registry
     - Prevents duplicate handlers for existing loggers
     - Structured formatting with script name, function, and line numbers
     - UTF-8 encoding support for cross-platform compatibility
+    - Attaches the shared QueueHandler so all loggers feed one listener
 
     Args:
         script_name: Script identifier for log entries
@@ -49,35 +178,20 @@ def setup_logger(script_name: str, log_level: int = LOG_LEVEL) -> logging.Logger
     Returns:
         Configured logger instance
     """
+    if script_name in _LOGGER_CACHE:
+        return _LOGGER_CACHE[script_name]
+
     logger = logging.getLogger(script_name)
 
     if logger.handlers:
+        _LOGGER_CACHE[script_name] = logger
         return logger
 
     logger.setLevel(log_level)
+    logger.addHandler(get_queue_handler())
 
-    formatter = logging.Formatter(
-        f"%(asctime)s - {script_name} - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s",
-        datefmt=DATE_FORMAT,
-    )
-
-    LOGS_DIR.mkdir(exist_ok=True)
-    today = datetime.now().strftime("%Y-%m-%d")
-    log_file = LOGS_DIR / f"analystbot_{today}.log"
-    log_file.touch(exist_ok=True)
-
-    file_handler = logging.FileHandler(log_file, encoding="utf-8")
-    file_handler.setLevel(log_level)
-    file_handler.setFormatter(formatter)
-
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-
-    logger.info(f"Logger initialized: {log_file}")
+    logger.info("Logger initialized: %s", get_log_file())
+    _LOGGER_CACHE[script_name] = logger
     return logger
 
 
@@ -90,7 +204,7 @@ def log_script_start(logger: logging.Logger, script_name: str, version: str = "3
     - Clear visual separation in log files
     """
     logger.info("=" * 50)
-    logger.info(f"STARTING {script_name.upper()} v{version}")
+    logger.info("STARTING %s v%s", script_name.upper(), version)
     logger.info("=" * 50)
 
 
@@ -106,7 +220,7 @@ def log_script_end(
     """
     duration = datetime.now() - start_time
     status = "COMPLETED" if success else "FAILED"
-    logger.info(f"{script_name.upper()} {status} in {duration}")
+    logger.info("%s %s in %s", script_name.upper(), status, duration)
 
 
 def clean_old_logs(days_to_keep: int = 30):
@@ -114,8 +228,8 @@ def clean_old_logs(days_to_keep: int = 30):
 
     Essential Features:
     - Automatic old log file detection and cleanup
-    - Date parsing from filename format (analystbot_YYYY-MM-DD.log)
-    - Safe deletion with error handling for invalid filenames
+    - String comparison of filename dates (analystbot_YYYY-MM-DD.log) against one cutoff
+    - Invalid filenames skipped without deletion
     - Returns list of cleaned files for audit logging
 
     Args:
@@ -127,18 +241,17 @@ def clean_old_logs(days_to_keep: int = 30):
     if not LOGS_DIR.exists():
         return []
 
-    cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+    # ISO dates sort lexicographically, so compare strings instead of parsing
+    cutoff_str = (datetime.now() - timedelta(days=days_to_keep)).strftime("%Y-%m-%d")
     cleaned_files = []
 
     for log_file in LOGS_DIR.glob("analystbot_*.log"):
-        try:
-            date_str = log_file.stem.split("_", 1)[1]
-            file_date = datetime.strptime(date_str, "%Y-%m-%d")
-            if file_date < cutoff_date:
-                log_file.unlink()
-                cleaned_files.append(log_file.name)
-        except (ValueError, IndexError):
+        date_str = log_file.stem[len("analystbot_") :]
+        if len(date_str) != 10 or not date_str.replace("-", "").isdigit():
             continue
+        if date_str <= cutoff_str:
+            log_file.unlink()
+            cleaned_files.append(log_file.name)
 
     return cleaned_files
 
@@ -158,7 +271,7 @@ def log_exceptions(logger: logging.Logger):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Exception in {func.__name__}: {e}", exc_info=True)
+                logger.error("Exception in %s: %s", func.__name__, e, exc_info=True)
                 raise
 
         return wrapper
@@ -8,7 +8,8 @@ Key Features:
 - Comprehensive error handling with critical vs non-critical script classification
 - Automated log cleanup and daily log rotation management
 - Telegram completion summaries with success rates and failure details
-- Subprocess timeout handling and return code validation
+- In-process script execution sharing one interpreter and its imports
+- SIGALRM timeout handling and exit code validation
 - Prerequisites validation (database, .env file, script dependencies)
 
 Executes the complete analyst bot workflow: data fetching, indicator calculation, and Telegram messaging.
@@ -17,7 +18,8 @@ Manages script dependencies, error handling, and completion reporting for automa
 
 import os
 import sys
-import subprocess
+import signal
+import importlib
 from datetime import datetime
 from pathlib import Path
 
@@ -62,6 +64,46 @@ EXECUTION_ORDER = [
 ]
 
 
+class ScriptTimeout(BaseException):
+    """Raised by SIGALRM when a script exceeds its timeout.
+
+    Derives from BaseException so the scripts' own `except Exception`
+    handlers cannot swallow it.
+    """
+
+
+def _raise_script_timeout(signum, frame):
+    raise ScriptTimeout()
+
+
+def run_script_main(script_file: str, timeout) -> int:
+    """Import a pipeline script and run its main() in this process.
+
+    Essential Features:
+    - Reuses the already loaded interpreter, pandas, numpy and sqlite3 imports
+    - sys.exit() codes from main() mapped to an integer return code
+    - SIGALRM-based timeout where the platform supports it
+    - Alarm armed before the import so module-level setup is covered too
+    """
+    use_alarm = timeout is not None and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_script_timeout)
+        signal.alarm(timeout)
+
+    try:
+        module = importlib.import_module(script_file[:-3])
+        module.main()
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        return e.code if isinstance(e.code, int) else 1
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
 def setup_logging():
     """Initialize logging and clean old log files.
 
@@ -74,7 +116,7 @@ def setup_logging():
 
     cleaned_files = clean_old_logs(days_to_keep=30)
     if cleaned_files:
-        logger.info(f"Cleaned {len(cleaned_files)} old log files")
+        logger.info("Cleaned %d old log files", len(cleaned_files))
     else:
         logger.info("No old logs to clean")
 
@@ -83,7 +125,7 @@ def run_script(script_info):
     """Execute single script with timeout and error handling.
 
     Essential Features:
-    - Subprocess execution with timeout protection
+    - In-process execution with timeout protection
     - Return code validation and error classification
     - Critical vs non-critical failure handling
     - Execution duration tracking and logging
@@ -96,35 +138,31 @@ def run_script(script_info):
 
     script_path = SCRIPTS_DIR / script_file
 
-    logger.info(f"Starting {script_name}")
+    logger.info("Starting %s", script_name)
 
     if not script_path.exists():
-        logger.error(f"Script not found: {script_path}")
+        logger.error("Script not found: %s", script_path)
         return not critical
 
     start_time = datetime.now()
 
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            cwd=PROJECT_ROOT,
-            timeout=timeout,
-        )
+        returncode = run_script_main(script_file, timeout)
 
         duration = datetime.now() - start_time
 
-        if result.returncode == 0:
-            logger.info(f"✅ {script_name} completed in {duration}")
+        if returncode == 0:
+            logger.info("✅ %s completed in %s", script_name, duration)
             return True
         else:
-            logger.error(f"❌ {script_name} failed (code {result.returncode})")
+            logger.error("❌ %s failed (code %s)", script_name, returncode)
             return not critical
 
-    except subprocess.TimeoutExpired:
-        logger.error(f"❌ {script_name} timed out after {timeout}s")
+    except ScriptTimeout:
+        logger.error("❌ %s timed out after %ss", script_name, timeout)
         return not critical
     except Exception as e:
-        logger.error(f"❌ {script_name} exception: {e}")
+        logger.error("❌ %s exception: %s", script_name, e)
         return not critical
 
 
@@ -135,17 +173,19 @@ def check_prerequisites():
     - Automatic data directory creation if missing
     - .env file existence check with required variable guidance
     - Script dependency validation across all execution steps
+    - One directory scan each for project root and scripts instead of per-file checks
     - Clear error messaging for missing components
     """
     logger.info("Checking prerequisites")
 
-    db_dir = PROJECT_ROOT / "data"
-    if not db_dir.exists():
+    with os.scandir(PROJECT_ROOT) as entries:
+        root_entries = {entry.name for entry in entries}
+
+    if "data" not in root_entries:
         logger.info("Creating data directory")
-        db_dir.mkdir(parents=True, exist_ok=True)
+        (PROJECT_ROOT / "data").mkdir(parents=True, exist_ok=True)
 
-    env_file = PROJECT_ROOT / ".env"
-    if not env_file.exists():
+    if ".env" not in root_entries:
         logger.warning("Missing .env file - create with:")
         logger.warning("  POLYGON_KEY=your_polygon_api_key")
         logger.warning("  FRED_API=your_fred_api_key")
@@ -158,14 +198,17 @@ def check_prerequisites():
             "  TELEGRAM_CHAT_MARKET_INDICATORS_ID=your_market_indicators_topic_id"
         )
 
+    with os.scandir(SCRIPTS_DIR) as entries:
+        script_files = {entry.name for entry in entries if entry.is_file()}
+
     missing_scripts = [
         script_info["script"]
         for script_info in EXECUTION_ORDER
-        if not (SCRIPTS_DIR / script_info["script"]).exists()
+        if script_info["script"] not in script_files
     ]
 
     if missing_scripts:
-        logger.error(f"Missing scripts: {missing_scripts}")
+        logger.error("Missing scripts: %s", missing_scripts)
         return False
 
     logger.info("✅ Prerequisites validated")
@@ -195,15 +238,22 @@ def send_completion_summary(
             else "⚠️ PARTIAL" if success_count > 0 else "❌ FAILED"
         )
 
-        message = f"{status}\n📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}\n⏱️ {duration}\n📊 {success_rate:.1f}% ({success_count}/{total_count})"
+        parts = [
+            status,
+            f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            f"⏱️ {duration}",
+            f"📊 {success_rate:.1f}% ({success_count}/{total_count})",
+        ]
 
         if failed_scripts:
-            message += f"\n❌ Failed: {', '.join(failed_scripts)}"
+            parts.append(f"❌ Failed: {', '.join(failed_scripts)}")
+
+        message = "\n".join(parts)
 
         send_telegram_message(message)
         logger.info("Summary sent to Telegram")
     except Exception as e:
-        logger.error(f"Failed to send summary: {e}")
+        logger.error("Failed to send summary: %s", e)
 
 
 def cleanup_old_logs():
@@ -217,7 +267,7 @@ def cleanup_old_logs():
     logger.info("Starting log cleanup")
     cleaned_files = clean_old_logs(days_to_keep=30)
     if cleaned_files:
-        logger.info(f"Deleted {len(cleaned_files)} old log files")
+        logger.info("Deleted %d old log files", len(cleaned_files))
     else:
         logger.info("No old logs to clean")
 
@@ -235,7 +285,7 @@ def main():
     setup_logging()
     start_time = datetime.now()
 
-    logger.info(f"Processing {len(EXECUTION_ORDER)} scripts")
+    logger.info("Processing %d scripts", len(EXECUTION_ORDER))
 
     if not check_prerequisites():
         logger.error("Prerequisites failed")
@@ -245,21 +295,21 @@ def main():
     failed_scripts = []
 
     for i, script_info in enumerate(EXECUTION_ORDER, 1):
-        logger.info(f"[{i}/{len(EXECUTION_ORDER)}] {script_info['name']}")
+        logger.info("[%d/%d] %s", i, len(EXECUTION_ORDER), script_info["name"])
 
         if run_script(script_info):
             success_count += 1
         else:
             failed_scripts.append(script_info["name"])
             if script_info["critical"]:
-                logger.error(f"Critical failure: {script_info['name']}")
+                logger.error("Critical failure: %s", script_info["name"])
                 break
 
     end_time = datetime.now()
 
-    logger.info(f"Completed: {success_count}/{len(EXECUTION_ORDER)} successful")
+    logger.info("Completed: %d/%d successful", success_count, len(EXECUTION_ORDER))
     if failed_scripts:
-        logger.info(f"Failed: {', '.join(failed_scripts)}")
+        logger.info("Failed: %s", ", ".join(failed_scripts))
 
     send_completion_summary(
         start_time, end_time, success_count, len(EXECUTION_ORDER), failed_scripts
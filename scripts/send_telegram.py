@@ -9,6 +9,9 @@ Key Features:
 - Topic-based message routing to separate BTD and STR Telegram channels
 - Environment variable validation with detailed credential status logging
 - Message length management with automatic chunking for Telegram limits
+- Persistent HTTP session reusing one TLS connection across messages
+- WAL-mode tuned SQLite connections via centralized db_config
+- Watchlist messages queued and sent together through a bulk sender
 - Error notification system with automatic failure reporting to Telegram
 
 Generates formatted BTD and STR watchlists from database indicators and sends to Telegram.
@@ -19,16 +22,21 @@ import os
 import sys
 import sqlite3
 import requests
+from bisect import bisect_right
+from itertools import accumulate
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-import pandas as pd
 
 # Removed PrettyTable import - using manual formatting for better control
 
-# Import centralized logging
+# Import centralized logging and database configuration
 from logging_config import setup_logger, log_script_start, log_script_end
+from db_config import connect_db
 
 # Setup logging
 logger = setup_logger("send_telegram")
@@ -74,6 +82,39 @@ if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
     logger.error("  TELEGRAM_CHAT_MARKET_INDICATORS_ID=your_market_indicators_topic_id")
 
 MAX_MESSAGE_LENGTH = 4000
+REQUEST_TIMEOUT = 10  # seconds per Telegram API request
+MAX_SEND_WORKERS = 4  # concurrent Telegram requests, well under 30 msg/s
+
+# Watchlist row layout, bound once: symbol, last price and three timeframes
+WATCHLIST_ROW_FORMAT = "{:<5} {:>6.2f} {:>5.2f} {:>5.2f} {:>5.2f}".format
+WATCHLIST_HEADER_FORMAT = "{:<5} {:>6} {:>5} {:>5} {:>5}".format
+
+# Shared HTTP session so every message reuses the same Telegram connection
+SESSION = requests.Session()
+# Retry rate limits only: a 429 means the message was rejected, while a 5xx
+# or slow response may come after Telegram already accepted it, so retrying
+# those could post the same message twice
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        max_retries=Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=(429,),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+    ),
+)
+
+# SQL statements kept as constants so sqlite3 reuses the prepared statements
+LATEST_INDICATORS_SQL = """
+SELECT s.symbol, s.close_price, s.btd_22, s.btd_66, s.btd_132,
+       s.str_22, s.str_66, s.str_132
+FROM (SELECT symbol, MAX(date) AS date FROM stock_data GROUP BY symbol) latest
+JOIN stock_data s ON s.symbol = latest.symbol AND s.date = latest.date
+"""
 
 
 def send_telegram_message(
@@ -83,6 +124,8 @@ def send_telegram_message(
 
     Essential Features:
     - Telegram Bot API integration with credential validation
+    - Keep-alive connection reuse through the shared requests session
+    - Request timeout and adapter-level retries for 429 rate-limit responses only
     - Topic ID support for threaded channel messaging
     - HTTP error handling with detailed exception logging
     - Markdown parsing support for formatted messages
@@ -98,7 +141,7 @@ def send_telegram_message(
         payload["message_thread_id"] = topic_id
 
     try:
-        response = requests.post(url, json=payload)
+        response = SESSION.post(url, json=payload, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
         logger.info("Message sent successfully")
         return True
@@ -107,184 +150,213 @@ def send_telegram_message(
         return False
 
 
+def send_messages_bulk(messages: List[Tuple[str, Optional[str]]]) -> List[bool]:
+    """Send several Telegram messages concurrently over the shared session.
+
+    Essential Features:
+    - All queued messages posted in one batch instead of one after another
+    - Thread pool capped at MAX_SEND_WORKERS to stay inside Telegram limits
+    - Shared SESSION connection pool reused by every worker
+    - Per-message success flags returned in input order
+    """
+    if not messages:
+        return []
+
+    texts, topic_ids = zip(*messages)
+    workers = min(MAX_SEND_WORKERS, len(messages))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(send_telegram_message, texts, topic_ids))
+
+
 def split_long_message(message: str, max_length: int = MAX_MESSAGE_LENGTH) -> List[str]:
     """Split message into chunks if exceeds Telegram limits.
 
     Essential Features:
     - 4000-character limit compliance with Telegram API restrictions
     - Line-based splitting to preserve table formatting integrity
+    - Chunk boundaries found by binary search over cumulative line lengths
+    - Oversized single lines kept whole in their own chunk
     - Returns list of chunks for sequential message sending
     """
     if len(message) <= max_length:
         return [message]
 
-    chunks = []
-    current_chunk = ""
     lines = message.split("\n")
+    # offsets[k] = characters (newlines included) taken by the first k lines
+    offsets = [0, *accumulate(len(line) + 1 for line in lines)]
 
-    for line in lines:
-        if len(current_chunk) + len(line) + 1 <= max_length:
-            current_chunk += line + "\n"
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = line + "\n"
-
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    chunks = []
+    start = 0
+    while start < len(lines):
+        end = bisect_right(offsets, offsets[start] + max_length) - 1
+        end = max(end, start + 1)
+        chunks.append("\n".join(lines[start:end]).strip())
+        start = end
 
     return chunks
 
 
-def get_btd_data() -> List[Dict]:
-    """Retrieve BTD signals where BTD_22 < 0 (buy opportunities).
+def get_latest_indicator_data() -> List[Dict]:
+    """Retrieve latest-date price and indicator values for every symbol.
 
     Essential Features:
-    - Contrarian signal filtering for oversold conditions (BTD_22 < 0)
-    - Latest date data retrieval using MAX(date) subquery
-    - Multi-timeframe BTD values (22, 66, 132) with current price
-    - Ordered results by BTD_22 for priority ranking
-    """
-    conn = sqlite3.connect(DB_PATH)
-    query = """
-        SELECT symbol, btd_22, btd_66, btd_132, close_price
-        FROM stock_data s1
-        WHERE s1.date = (SELECT MAX(date) FROM stock_data s2 WHERE s2.symbol = s1.symbol)
-        AND btd_22 < 0
-        AND btd_22 IS NOT NULL
-        ORDER BY btd_22 ASC
+    - Single query shared by the BTD and STR watchlists
+    - Latest date per symbol from one GROUP BY over the (symbol, date) index
+    - Primary key lookup joins each symbol to its latest row
+    - Multi-timeframe BTD and STR values (22, 66, 132) with current price
+    - Rows read straight from the cursor via sqlite3.Row, no pandas import
+    - Read-only connection so the report never takes the write lock
+    - Connection closed in a finally block even if the query fails
     """
+    conn = connect_db(DB_PATH, read_only=True)
+    try:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(LATEST_INDICATORS_SQL).fetchall()
+    finally:
+        # Not close_db: PRAGMA optimize writes statistics, which a read-only
+        # connection rejects
+        conn.close()
 
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    return [dict(row) for row in rows]
 
-    return df.to_dict("records") if not df.empty else []
 
+def get_btd_data(latest_data: List[Dict]) -> List[Dict]:
+    """Select BTD signals where BTD_22 < 0 (buy opportunities).
 
-def generate_btd_watchlist(btd_data: List[Dict]) -> str:
+    Essential Features:
+    - Contrarian signal filtering for oversold conditions (BTD_22 < 0)
+    - Reuses the shared latest-date rows instead of querying again
+    - Ordered results by BTD_22 for priority ranking
+    """
+    btd_data = [
+        data
+        for data in latest_data
+        if data["btd_22"] is not None and data["btd_22"] < 0
+    ]
+    return sorted(btd_data, key=lambda data: data["btd_22"])
+
+
+def generate_btd_watchlist(btd_data: List[Dict], date_str: str) -> str:
     """Format BTD data into clean monospace table.
 
     Essential Features:
     - Monospace table generation with precise column alignment
-    - Right-justified number formatting for price and indicator values
+    - Right-justified number formatting via the shared precompiled row format
     - Markdown code block wrapping for Telegram rendering
     - Header row with consistent spacing and column labels
-    - Date stamp integration in title for reference tracking
+    - Date stamp supplied by the caller so both watchlists share one timestamp
     """
-    now = datetime.now().strftime("%Y-%m-%d")
-
     if not btd_data:
-        return f"📈 ***BTD Watchlist ({now})***\nNo signals."
+        return f"📈 ***BTD Watchlist ({date_str})***\nNo signals."
 
     # Mobile-optimized header with left-aligned symbol column
-    header = f"{'Symbol':<5} {'Last':>6} {'B22':>5} {'B66':>5} {'B132':>5}"
-    lines = [header]
+    header = WATCHLIST_HEADER_FORMAT("Symbol", "Last", "B22", "B66", "B132")
 
-    for data in btd_data:
-        symbol = data["symbol"][:5]  # Truncate long symbols for mobile
-        last_price = data["close_price"] or 0
-        btd_22 = data["btd_22"] or 0
-        btd_66 = data["btd_66"] or 0
-        btd_132 = data["btd_132"] or 0
+    # Symbols truncated to 5 characters for mobile
+    rows = [
+        WATCHLIST_ROW_FORMAT(
+            data["symbol"][:5],
+            data["close_price"] or 0,
+            data["btd_22"] or 0,
+            data["btd_66"] or 0,
+            data["btd_132"] or 0,
+        )
+        for data in btd_data
+    ]
 
-        line = f"{symbol:<5} {last_price:>6.2f} {btd_22:>5.2f} {btd_66:>5.2f} {btd_132:>5.2f}"
-        lines.append(line)
+    formatted_table = "\n".join([header, *rows])
+    return f"📈 ***BTD Watchlist ({date_str})***\n```\n{formatted_table}\n```"
 
-    formatted_table = "\n".join(lines)
-    return f"📈 ***BTD Watchlist ({now})***\n```\n{formatted_table}\n```"
 
-
-def send_btd_watchlist(btd_data: List[Dict]):
-    """Send BTD watchlist to Telegram.
+def prepare_btd_watchlist(
+    btd_data: List[Dict], date_str: str
+) -> Tuple[str, Optional[str]]:
+    """Build BTD watchlist message and its Telegram topic for bulk sending.
 
     Essential Features:
     - Console output for local monitoring and debugging
     - Topic-specific routing using BTD_TOPIC_ID for channel organization
     - Symbol count logging for processing confirmation
+    - Returns (message, topic_id) for send_messages_bulk
     """
-    logger.info(f"Sending BTD watchlist ({len(btd_data)} symbols)")
-    watchlist_message = generate_btd_watchlist(btd_data)
+    logger.info(f"Prepared BTD watchlist ({len(btd_data)} symbols)")
+    watchlist_message = generate_btd_watchlist(btd_data, date_str)
     print(watchlist_message)
-    send_telegram_message(watchlist_message, topic_id=BTD_TOPIC_ID)
+    return watchlist_message, BTD_TOPIC_ID
 
 
-def get_str_data() -> List[Dict]:
-    """Retrieve STR signals where STR_22 > 0 (short opportunities).
+def get_str_data(latest_data: List[Dict]) -> List[Dict]:
+    """Select STR signals where STR_22 > 0 (short opportunities).
 
     Essential Features:
     - Contrarian signal filtering for overbought conditions (STR_22 > 0)
-    - Latest date data retrieval using MAX(date) subquery
-    - Multi-timeframe STR values (22, 66, 132) with current price
+    - Reuses the shared latest-date rows instead of querying again
     - Ordered results by STR_22 for priority ranking
     """
-    conn = sqlite3.connect(DB_PATH)
-    query = """
-        SELECT symbol, str_22, str_66, str_132, close_price
-        FROM stock_data s1
-        WHERE s1.date = (SELECT MAX(date) FROM stock_data s2 WHERE s2.symbol = s1.symbol)
-        AND str_22 > 0
-        AND str_22 IS NOT NULL
-        ORDER BY str_22 DESC
-    """
-
-    df = pd.read_sql_query(query, conn)
-    conn.close()
-
-    return df.to_dict("records") if not df.empty else []
+    str_data = [
+        data
+        for data in latest_data
+        if data["str_22"] is not None and data["str_22"] > 0
+    ]
+    return sorted(str_data, key=lambda data: data["str_22"], reverse=True)
 
 
-def generate_str_watchlist(str_data: List[Dict]) -> str:
+def generate_str_watchlist(str_data: List[Dict], date_str: str) -> str:
     """Format STR data into clean monospace table.
 
     Essential Features:
     - Monospace table generation with precise column alignment
-    - Right-justified number formatting for price and indicator values
+    - Right-justified number formatting via the shared precompiled row format
     - Markdown code block wrapping for Telegram rendering
     - Header row with consistent spacing and column labels
-    - Date stamp integration in title for reference tracking
+    - Date stamp supplied by the caller so both watchlists share one timestamp
     """
-    now = datetime.now().strftime("%Y-%m-%d")
-
     if not str_data:
-        return f"📉 ***STR Watchlist ({now})***\nNo signals."
+        return f"📉 ***STR Watchlist ({date_str})***\nNo signals."
 
     # Mobile-optimized header with left-aligned symbol column
-    header = f"{'Symbol':<5} {'Last':>6} {'S22':>5} {'S66':>5} {'S132':>5}"
-    lines = [header]
-
-    for data in str_data:
-        symbol = data["symbol"][:5]  # Truncate long symbols for mobile
-        last_price = data["close_price"] or 0
-        str_22 = data["str_22"] or 0
-        str_66 = data["str_66"] or 0
-        str_132 = data["str_132"] or 0
+    header = WATCHLIST_HEADER_FORMAT("Symbol", "Last", "S22", "S66", "S132")
 
-        line = f"{symbol:<5} {last_price:>6.2f} {str_22:>5.2f} {str_66:>5.2f} {str_132:>5.2f}"
-        lines.append(line)
+    # Symbols truncated to 5 characters for mobile
+    rows = [
+        WATCHLIST_ROW_FORMAT(
+            data["symbol"][:5],
+            data["close_price"] or 0,
+            data["str_22"] or 0,
+            data["str_66"] or 0,
+            data["str_132"] or 0,
+        )
+        for data in str_data
+    ]
 
-    formatted_table = "\n".join(lines)
-    return f"📉 ***STR Watchlist ({now})***\n```\n{formatted_table}\n```"
+    formatted_table = "\n".join([header, *rows])
+    return f"📉 ***STR Watchlist ({date_str})***\n```\n{formatted_table}\n```"
 
 
-def send_str_watchlist(str_data: List[Dict]):
-    """Send STR watchlist to Telegram.
+def prepare_str_watchlist(
+    str_data: List[Dict], date_str: str
+) -> Tuple[str, Optional[str]]:
+    """Build STR watchlist message and its Telegram topic for bulk sending.
 
     Essential Features:
     - Console output for local monitoring and debugging
     - Topic-specific routing using STR_TOPIC_ID for channel organization
     - Symbol count logging for processing confirmation
+    - Returns (message, topic_id) for send_messages_bulk
     """
-    logger.info(f"Sending STR watchlist ({len(str_data)} symbols)")
-    watchlist_message = generate_str_watchlist(str_data)
+    logger.info(f"Prepared STR watchlist ({len(str_data)} symbols)")
+    watchlist_message = generate_str_watchlist(str_data, date_str)
     print(watchlist_message)
-    send_telegram_message(watchlist_message, topic_id=STR_TOPIC_ID)
+    return watchlist_message, STR_TOPIC_ID
 
 
 def main():
     """Execute Telegram messaging workflow.
 
     Essential Features:
-    - Sequential BTD and STR watchlist generation and transmission
+    - Single latest-data query shared by BTD and STR watchlists
+    - BTD and STR watchlists generated in order, sent in one concurrent batch
+    - Per-watchlist send result logged once the batch returns
     - Comprehensive error handling with automatic error notification to Telegram
     - Script timing and completion status tracking
     - Exception logging with stack trace capture for debugging
@@ -293,13 +365,23 @@ def main():
     log_script_start(logger, "Telegram Messaging Script")
 
     try:
+        latest_data = get_latest_indicator_data()
+        date_str = datetime.now().strftime("%Y-%m-%d")
+
         logger.info("Generating BTD watchlist")
-        btd_data = get_btd_data()
-        send_btd_watchlist(btd_data)
+        btd_data = get_btd_data(latest_data)
+        btd_message = prepare_btd_watchlist(btd_data, date_str)
 
         logger.info("Generating STR watchlist")
-        str_data = get_str_data()
-        send_str_watchlist(str_data)
+        str_data = get_str_data(latest_data)
+        str_message = prepare_str_watchlist(str_data, date_str)
+
+        results = send_messages_bulk([btd_message, str_message])
+        for name, sent in zip(("BTD", "STR"), results):
+            if sent:
+                logger.info(f"Sent {name} watchlist")
+            else:
+                logger.error(f"Failed to send {name} watchlist")
 
         logger.info("✅ Telegram messaging completed")
         log_script_end(logger, "Telegram Messaging Script", start_time, True)
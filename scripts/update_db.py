@@ -5,9 +5,13 @@ Market Data Update Script
 
 Key Features:
 - OHLCV data fetching from Polygon.io with rate limit compliance (5 calls/minute)
+- Sliding-window rate limiter that only waits when the call budget is spent
+- Symbol requests fetched concurrently on a thread pool sharing that limiter
+- One aggregates range request per symbol instead of one request per trading day
 - NYSE trading calendar integration for precise business day calculations
 - Intelligent missing data detection and batch fetching optimization
-- SQLite database storage with INSERT OR REPLACE for data integrity
+- SQLite database storage with in-place UPSERT (ON CONFLICT DO UPDATE)
+- WAL-mode tuned SQLite connections via centralized db_config
 - Support for 95-symbol watchlist with individual progress tracking
 - New symbol detection with full historical data backfill (365 days)
 
@@ -18,15 +22,20 @@ Manages API rate limits and trading day calculations for efficient data retrieva
 import os
 import sys
 import time
-import sqlite3
-from datetime import datetime, timedelta
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from polygon import RESTClient
+from urllib3.exceptions import MaxRetryError, ResponseError
 import pandas_market_calendars as mcal
 from dotenv import load_dotenv
 
-# Import centralized logging
+# Import centralized logging and database configuration
 from logging_config import setup_logger, log_script_start, log_script_end
+from db_config import close_db, connect_db
 
 # Setup logging
 logger = setup_logger("update_db")
@@ -44,9 +53,36 @@ else:
     logger.warning(f"Environment file not found: {ENV_PATH}")
     load_dotenv()  # Try default locations
 
-REQUEST_PAUSE_DURATION = 13  # Rate limit: 5 calls/minute + buffer
+RATE_LIMIT_CALLS = 5  # Polygon free tier: 5 calls/minute
+RATE_LIMIT_PERIOD = 60  # seconds
+RETRY_BACKOFF = (15, 30, 60)  # seconds to wait after a rate-limited request
+FETCH_WORKERS = 5  # concurrent Polygon requests, bounded by the rate limiter
 POLYGON_KEY = os.getenv("POLYGON_KEY")
 
+# SQL statements kept as constants so sqlite3 reuses the prepared statements
+SYMBOL_COVERAGE_SQL = """
+SELECT symbol, MAX(date), SUM(date >= ?)
+FROM stock_data
+GROUP BY symbol
+"""
+
+WINDOW_DATES_SQL = """
+SELECT date FROM stock_data
+WHERE symbol = ? AND date BETWEEN ? AND ?
+"""
+
+UPSERT_OHLCV_SQL = """
+INSERT INTO stock_data
+    (symbol, date, open_price, high_price, low_price, close_price, volume)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(symbol, date) DO UPDATE SET
+    open_price = excluded.open_price,
+    high_price = excluded.high_price,
+    low_price = excluded.low_price,
+    close_price = excluded.close_price,
+    volume = excluded.volume
+"""
+
 # Watchlist - this should match your current watchlist plus additional indices
 WATCHLIST = [
     # Core portfolio
@@ -161,6 +197,38 @@ WATCHLIST = [
 ]
 
 
+class RateLimiter:
+    """Sliding-window rate limiter for Polygon API calls.
+
+    Essential Features:
+    - Allows up to max_calls requests in any rolling period
+    - Sleeps only when the window is full instead of after every call
+    - Monotonic clock immune to system time changes
+    - Lock-protected so fetch worker threads share one call budget
+    """
+
+    def __init__(self, max_calls: int, period: float):
+        self.max_calls = max_calls
+        self.period = period
+        self.calls = deque()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """Block until another call fits in the window, then record it."""
+        with self.lock:
+            now = time.monotonic()
+            while self.calls and now - self.calls[0] >= self.period:
+                self.calls.popleft()
+
+            if len(self.calls) >= self.max_calls:
+                time.sleep(self.period - (now - self.calls.popleft()))
+
+            self.calls.append(time.monotonic())
+
+
+RATE_LIMITER = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+
 def initialize_polygon_client():
     """Initialize Polygon REST client with API key validation.
 
@@ -168,134 +236,164 @@ def initialize_polygon_client():
     - Environment variable validation for POLYGON_KEY
     - REST client initialization with error handling
     - Connection testing and authentication verification
+    - One keep-alive HTTPS connection per fetch worker in the urllib3 pool
     """
     if not POLYGON_KEY:
         logger.error("POLYGON_KEY not found in environment variables")
         sys.exit(1)
 
-    return RESTClient(POLYGON_KEY)
-
-
-def symbol_exists(symbol):
-    """Check if symbol has any data in database.
+    client = RESTClient(POLYGON_KEY)
+    # urllib3 keeps a single idle connection per host by default; size the pool
+    # so concurrent fetch workers reuse their TLS connections instead of dropping them.
+    # RESTClient has no per-host pool size option (num_pools counts hosts), so this
+    # reaches into its PoolManager and falls back to the default if that moves.
+    pool_kw = getattr(getattr(client, "client", None), "connection_pool_kw", None)
+    if isinstance(pool_kw, dict):
+        pool_kw["maxsize"] = FETCH_WORKERS
+    else:
+        logger.warning(
+            "Polygon client connection pool not found; "
+            "using default pool size for fetch workers"
+        )
+    return client
+
+
+def get_symbol_coverage(conn, window_start):
+    """Get latest date and in-window row count for every symbol in database.
 
     Essential Features:
-    - Quick existence check using COUNT query
-    - Database connection handling with proper cleanup
-    - Boolean return for new vs existing symbol detection
+    - Single GROUP BY query replacing per-symbol existence and freshness checks
+    - Latest stored date per symbol via MAX(date)
+    - Row count from window_start onward for gap detection
+    - Dict keyed by symbol; missing keys are new symbols
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT 1 FROM stock_data WHERE symbol = ? LIMIT 1", (symbol,))
-    result = c.fetchone() is not None
-    conn.close()
-    return result
+    rows = conn.execute(SYMBOL_COVERAGE_SQL, (window_start,)).fetchall()
+    return {
+        symbol: (latest_date, window_count)
+        for symbol, latest_date, window_count in rows
+    }
 
 
-def get_latest_db_date(symbol):
-    """Get most recent date for symbol in database.
+def get_trading_days(days_back=365):
+    """Load NYSE trading days once for the whole update run.
 
     Essential Features:
-    - Retrieves latest date using MAX(date) query
-    - Date format conversion and validation
-    - Handles missing data gracefully
+    - Single calendar build and valid_days() call shared by all symbols
+    - Covers both the 365-day new-symbol backfill and the 150-day window
+    - Returns ascending datetime.date values ending yesterday
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT MAX(date) FROM stock_data WHERE symbol = ?", (symbol,))
-    result = c.fetchone()[0]
-    conn.close()
-    return result
+    end_date = datetime.now().date() - timedelta(days=1)
+    start_date = datetime.now().date() - timedelta(days=days_back)
+    nyse = mcal.get_calendar("NYSE")
+    return [
+        day.date() for day in nyse.valid_days(start_date=start_date, end_date=end_date)
+    ]
 
 
-def get_missing_trading_days(symbol, days_needed=150):
+def get_missing_trading_days(conn, symbol, trading_days, days_needed=150):
     """Calculate missing trading days for symbol based on NYSE calendar.
 
     Essential Features:
-    - NYSE calendar integration for accurate trading day calculation
-    - Efficient calendar-to-trading-day conversion (~252 trading days/year)
-    - Database comparison using set operations for missing date detection
-    - Automatic search period extension if insufficient trading days found
-    - Optimized query using LIMIT for recent data comparison
+    - Required window sliced from the precomputed NYSE trading days
+    - Database comparison using set operations on ISO date strings (no strptime)
+    - Date lookup bounded to the required window
     """
-    nyse = mcal.get_calendar("NYSE")
-    end_date = datetime.now().date() - timedelta(days=1)
-    calendar_days_needed = int(days_needed / 0.69) + 10  # ~252 trading days/year
-    start_date = end_date - timedelta(days=calendar_days_needed)
+    required_trading_days = trading_days[-days_needed:]
+    first_day = required_trading_days[0].isoformat()
+    last_day = required_trading_days[-1].isoformat()
 
-    all_trading_days = nyse.valid_days(start_date=start_date, end_date=end_date)
+    rows = conn.execute(WINDOW_DATES_SQL, (symbol, first_day, last_day)).fetchall()
+    db_dates = {row[0] for row in rows}
 
-    if len(all_trading_days) < days_needed:
-        logger.warning(f"Extending search period for {symbol}")
-        start_date = end_date - timedelta(days=int(days_needed / 0.65))
-        all_trading_days = nyse.valid_days(start_date=start_date, end_date=end_date)
+    missing_dates = [
+        day for day in required_trading_days if day.isoformat() not in db_dates
+    ]
 
-    required_trading_days = all_trading_days[-days_needed:]
+    logger.debug(f"{symbol}: {len(db_dates)} have, {len(missing_dates)} missing")
+    return missing_dates
 
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute(
-        "SELECT date FROM stock_data WHERE symbol = ? ORDER BY date DESC LIMIT ?",
-        (symbol, days_needed),
-    )
-    db_dates = {datetime.strptime(row[0], "%Y-%m-%d").date() for row in c.fetchall()}
-    conn.close()
 
-    missing_dates = [day for day in required_trading_days if day.date() not in db_dates]
+def get_daily_aggs(client, symbol, start_date, end_date):
+    """Request daily aggregates for a date range within the rate limit.
 
-    logger.info(f"{symbol}: {len(db_dates)} have, {len(missing_dates)} missing")
-    return missing_dates
+    Essential Features:
+    - Waits on the shared sliding-window limiter before every request
+    - Exponential backoff (15s, 30s, 60s) once the client's own retries are exhausted
+    - Warning distinguishes 429 rate limiting from connection and server errors
+    - Re-raises after the final attempt so callers can log the failure
+    """
+    for backoff in RETRY_BACKOFF + (None,):
+        RATE_LIMITER.wait()
+        try:
+            return client.get_aggs(
+                symbol, 1, "day", start_date, end_date, adjusted=True, limit=50000
+            )
+        except MaxRetryError as e:
+            if backoff is None:
+                raise
+            if isinstance(e.reason, ResponseError) and "429" in str(e.reason):
+                logger.warning(f"Rate limited on {symbol}, retrying in {backoff}s")
+            else:
+                logger.warning(
+                    f"Request for {symbol} failed after retries, "
+                    f"retrying in {backoff}s: {e.reason}"
+                )
+            time.sleep(backoff)
 
 
 def fetch_ohlcv_data(client, symbol, start_date, end_date):
-    """Fetch and store OHLCV data for date range with rate limiting.
+    """Fetch OHLCV rows for date range with rate limiting.
 
     Essential Features:
-    - Polygon API daily OHLC data retrieval with adjusted prices
-    - Rate limiting compliance with 13-second delays between calls
+    - Single Polygon aggregates request covering the whole date range
+    - Rate limiting through the shared sliding-window limiter
     - Data validation and null value handling with precision rounding
-    - INSERT OR REPLACE database operations for data integrity
-    - Progress tracking with success/failure counting per symbol
+    - No database access, so it is safe to run on fetch worker threads
+    - Request errors logged and an empty or partial row list returned
     """
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    rows = []
 
-    nyse = mcal.get_calendar("NYSE")
-    trading_days = nyse.valid_days(start_date=start_date, end_date=end_date)
-    logger.info(f"Fetching {len(trading_days)} days for {symbol}")
-    successful_updates = 0
-
-    for day in trading_days:
-        date_str = day.strftime("%Y-%m-%d")
-        try:
-            resp = client.get_daily_open_close_agg(symbol, date_str, adjusted="true")
-            if getattr(resp, "status", None) != "OK":
+    try:
+        bars = get_daily_aggs(client, symbol, start_date, end_date)
+        for bar in bars:
+            if bar.timestamp is None:
                 continue
 
-            c.execute(
-                """INSERT OR REPLACE INTO stock_data 
-                (symbol, date, open_price, high_price, low_price, close_price, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            rows.append(
                 (
-                    resp.symbol,
-                    resp.from_,
-                    round(resp.open, 2) if resp.open is not None else None,
-                    round(resp.high, 2) if resp.high is not None else None,
-                    round(resp.low, 2) if resp.low is not None else None,
-                    round(resp.close, 2) if resp.close is not None else None,
-                    resp.volume,
-                ),
+                    symbol,
+                    datetime.fromtimestamp(
+                        bar.timestamp / 1000, tz=timezone.utc
+                    ).strftime("%Y-%m-%d"),
+                    round(bar.open, 2) if bar.open is not None else None,
+                    round(bar.high, 2) if bar.high is not None else None,
+                    round(bar.low, 2) if bar.low is not None else None,
+                    round(bar.close, 2) if bar.close is not None else None,
+                    bar.volume,
+                )
             )
-            conn.commit()
-            successful_updates += 1
 
-        except Exception as e:
-            logger.error(f"Error fetching {symbol} {date_str}: {e}")
+    except Exception as e:
+        logger.error(f"Error fetching {symbol} {start_date} to {end_date}: {e}")
+
+    return rows
 
-        time.sleep(REQUEST_PAUSE_DURATION)
 
-    conn.close()
-    logger.info(f"✅ {symbol}: {successful_updates}/{len(trading_days)} updated")
+def store_ohlcv_data(conn, symbol, rows, day_count):
+    """Store fetched OHLCV rows for one symbol.
+
+    Essential Features:
+    - Single executemany UPSERT and one commit per symbol on the shared connection
+    - ON CONFLICT DO UPDATE keeps existing indicator columns intact
+    - Progress tracking with success/failure counting per symbol
+    - Returns the number of rows written for the run summary
+    """
+    if rows:
+        conn.executemany(UPSERT_OHLCV_SQL, rows)
+        conn.commit()
+
+    logger.info(f"✅ {symbol}: {len(rows)}/{day_count} updated")
+    return len(rows)
 
 
 def update_ohlcv_data():
@@ -304,33 +402,86 @@ def update_ohlcv_data():
     Essential Features:
     - Processes 95-symbol watchlist with progress tracking
     - New symbol detection with 365-day historical backfill
+    - Incremental updates queued before new-symbol backfills
     - Missing data identification using 150-trading-day requirement
-    - Batch date range optimization to minimize API calls
-    - Individual symbol success confirmation and logging
+    - NYSE trading days computed once per run and shared by all symbols
+    - One coverage query skips up-to-date symbols without per-symbol SQL
+    - Batch date range optimization: one aggregates request per symbol
+    - Requests run on FETCH_WORKERS threads; all database writes stay on this thread
+    - One tuned database connection shared by every lookup and write
+    - Per-symbol planning logged at DEBUG; one INFO line per fetched symbol
+    - Single end-of-run summary of up-to-date, updated and empty symbols
     """
     logger.info(f"Updating {len(WATCHLIST)} symbols (150 trading days)")
     client = initialize_polygon_client()
+    trading_days = get_trading_days(days_back=365)
+    required_trading_days = trading_days[-150:]
+    last_trading_day = required_trading_days[-1].isoformat()
 
-    for i, symbol in enumerate(WATCHLIST, 1):
-        logger.info(f"[{i}/{len(WATCHLIST)}] {symbol}")
-
-        if not symbol_exists(symbol):
-            logger.info(f"New symbol {symbol} - fetching 1 year history")
-            start_date = datetime.now().date() - timedelta(days=365)
-            end_date = datetime.now().date() - timedelta(days=1)
-            fetch_ohlcv_data(client, symbol, start_date, end_date)
-        else:
-            missing_dates = get_missing_trading_days(symbol, days_needed=150)
-            if missing_dates:
-                if len(missing_dates) > 1:
-                    start_date = min(missing_dates).date()
-                    end_date = max(missing_dates).date()
-                    fetch_ohlcv_data(client, symbol, start_date, end_date)
-                else:
-                    single_date = missing_dates[0].date()
-                    fetch_ohlcv_data(client, symbol, single_date, single_date)
+    conn = connect_db(DB_PATH)
+    try:
+        coverage = get_symbol_coverage(conn, required_trading_days[0].isoformat())
+        incremental_jobs = []
+        backfill_jobs = []
+        up_to_date = []
+
+        for i, symbol in enumerate(WATCHLIST, 1):
+            logger.debug(f"[{i}/{len(WATCHLIST)}] {symbol}")
+            latest_date, window_count = coverage.get(symbol, (None, 0))
+
+            if latest_date is None:
+                logger.info(f"New symbol {symbol} - fetching 1 year history")
+                start_date = datetime.now().date() - timedelta(days=365)
+                end_date = datetime.now().date() - timedelta(days=1)
+                backfill_jobs.append((symbol, start_date, end_date))
+            elif latest_date >= last_trading_day and window_count >= len(
+                required_trading_days
+            ):
+                logger.debug(f"✅ {symbol} up to date")
+                up_to_date.append(symbol)
             else:
-                logger.info(f"✅ {symbol} up to date")
+                missing_dates = get_missing_trading_days(
+                    conn, symbol, trading_days, days_needed=150
+                )
+                if missing_dates:
+                    incremental_jobs.append(
+                        (symbol, min(missing_dates), max(missing_dates))
+                    )
+                else:
+                    logger.debug(f"✅ {symbol} up to date")
+                    up_to_date.append(symbol)
+
+        # Short incremental updates are queued ahead of one-year backfills so a newly
+        # added ticker does not hold up the daily refresh of existing symbols
+        fetch_jobs = incremental_jobs + backfill_jobs
+        logger.info(
+            f"{len(incremental_jobs)} incremental, {len(backfill_jobs)} backfill requests"
+        )
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            futures = [
+                executor.submit(fetch_ohlcv_data, client, symbol, start_date, end_date)
+                for symbol, start_date, end_date in fetch_jobs
+            ]
+            rows_written = 0
+            empty_symbols = []
+            for (symbol, start_date, end_date), future in zip(fetch_jobs, futures):
+                day_count = bisect_right(trading_days, end_date) - bisect_left(
+                    trading_days, start_date
+                )
+                stored = store_ohlcv_data(conn, symbol, future.result(), day_count)
+                rows_written += stored
+                if not stored:
+                    empty_symbols.append(symbol)
+
+        logger.info(
+            f"✅ {len(up_to_date)} up to date, {len(fetch_jobs)} fetched "
+            f"({rows_written} rows), {len(empty_symbols)} without data"
+        )
+        if empty_symbols:
+            logger.warning(f"No data returned for: {', '.join(empty_symbols)}")
+    finally:
+        close_db(conn)
 
 
 def main():